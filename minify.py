@@ -6,14 +6,23 @@ This script synchronizes files from src/.roo to templates/base/.roo, compressing
 the content using external LLM compression techniques.
 
 It can process entire directories or individual files as needed.
+
+The compression pipeline is also importable: `Compressor` runs documents through
+a pluggable backend (`LLMBackend`, `LocalBackend`, `CacheBackend`) concurrently
+without any console output, and yields `CompressionResult` objects.
 """
 
 import os
 import sys
 import re
 import time
+import asyncio
+import hashlib
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional, Union
+from typing import Dict, List, Tuple, Any, Optional, Union, Iterable, Iterator, AsyncIterator, Awaitable
 
 import typer
 import tiktoken
@@ -28,30 +37,11 @@ from rich.syntax import Syntax
 from rich.markdown import Markdown
 from rich import box
 
-# Initialize Rich console
+# Initialize Rich console (used by the CLI only; the Compressor API never prints)
 console = Console()
 
-def compress_with_llm(content: str, endpoint: str, api_key: str, model: str, progress=None, task_id=None) -> Tuple[str, Dict[str, Any]]:
-    """
-    Compress content using an external LLM via OpenAI-compatible API.
-    
-    This function calls an external LLM to optimize the prompt while preserving
-    all factual information and instructions.
-    """
-    try:
-        # Count tokens before compression
-        enc = tiktoken.get_encoding("o200k_base")
-        tokens_before = len(enc.encode(content))
-        
-        # Initialize OpenAI client with custom endpoint
-        import openai
-        client = openai.OpenAI(
-            base_url=endpoint,
-            api_key=api_key
-        )
-        
-        # System prompt for compression
-        system_prompt = """Your goal is to optimize the number of tokens consumed by the text provided by user minimizing loss of precision and technical details when the output text will be interpreted by LLM instead of human. Analyze the complete text and stick to the pseudo-alogithm below and return ONLY output and nothing else. The output text does not have to be readable by humans, and use every opportunity to reduce the number of tokens used in the output while keeping it understandable by machine, while sticking to the algorithm below.
+# System prompt for compression
+COMPRESSION_PROMPT = """Your goal is to optimize the number of tokens consumed by the text provided by user minimizing loss of precision and technical details when the output text will be interpreted by LLM instead of human. Analyze the complete text and stick to the pseudo-alogithm below and return ONLY output and nothing else. The output text does not have to be readable by humans, and use every opportunity to reduce the number of tokens used in the output while keeping it understandable by machine, while sticking to the algorithm below.
 compress(input)->output:
   preserve_exact={headers,titles,paths,protocols,names,identifiers,values,code,xml_tools(<*>),xml_contracts}
   preserve_semantic={structure,hierarchy,logic,relationships,content}
@@ -65,206 +55,435 @@ compress(input)->output:
   special_rule=NEVER_modify_xml_tool_syntax
   return=compressed_content_only_no_surrounding_text
         """
-        
-        if progress and task_id:
-            progress.update(task_id, description=f"[cyan]Calling LLM API ({model})[/]")
-        else:
-            console.print(f"[cyan]Calling external LLM API ({model}) for compression...[/]")
-            
+
+
+@dataclass
+class CompressionResult:
+    """
+    Outcome of compressing a single document.
+    
+    `content` holds the compressed text, or the original text when the backend
+    failed (in which case `error` is set). It is None only when the document
+    could not be read at all or failed unexpectedly.
+    """
+    key: str
+    content: Optional[str]
+    original_size: int = 0
+    final_size: int = 0
+    tokens_before: Optional[int] = None
+    tokens_after: Optional[int] = None
+    processing_time: float = 0.0
+    backend: str = ""
+    error: Optional[str] = None
+    target: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def total_ratio(self) -> float:
+        return self.original_size / max(self.final_size, 1)
+
+    @property
+    def token_reduction(self) -> Optional[int]:
+        if self.tokens_before is None or self.tokens_after is None:
+            return None
+        return self.tokens_before - self.tokens_after
+
+    @property
+    def token_ratio(self) -> Optional[float]:
+        if self.tokens_before is None or self.tokens_after is None:
+            return None
+        return self.tokens_before / max(self.tokens_after, 1)
+
+
+class CompressionBackend:
+    """
+    Base class for compression backends.
+    
+    Subclasses implement `compress()`, returning the compressed text or raising
+    on failure. `cache_key` identifies the backend configuration so cached
+    output from one model is never served for another. `reports_tokens` tells
+    `Compressor` whether token statistics are meaningful by default.
+    """
+    name = "base"
+    reports_tokens = False
+
+    @property
+    def cache_key(self) -> str:
+        return self.name
+
+    async def compress(self, content: str) -> str:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class LocalBackend(CompressionBackend):
+    """Pass content through unchanged (plain copy, no external calls)."""
+    name = "local"
+
+    async def compress(self, content: str) -> str:
+        return content
+
+
+class LLMBackend(CompressionBackend):
+    """
+    Compress content using an external LLM via OpenAI-compatible API.
+    
+    The async client is created on first use and reused for every request, so
+    a long-lived backend keeps its connection pool warm.
+    """
+    name = "llm"
+    reports_tokens = True
+
+    def __init__(self, endpoint: str, api_key: str, model: str, system_prompt: str = COMPRESSION_PROMPT):
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.model = model
+        self.system_prompt = system_prompt
+        self._client = None
+
         # Determine appropriate temperature based on model name
         # Check for any variation of o3/o4 models (o4-mini, o3:flex, etc.)
         is_o_model = re.search(r'o[34][\s\-:_]?', model.lower()) is not None
-        temperature = 1.0 if is_o_model else 0.2
+        self.temperature = 1.0 if is_o_model else 0.2
 
-        # Call the LLM API
-        response = client.chat.completions.create(
-            model=model,
+    @property
+    def cache_key(self) -> str:
+        prompt_hash = hashlib.sha256(self.system_prompt.encode('utf-8')).hexdigest()[:16]
+        return f"{self.name}:{self.endpoint}:{self.model}:{self.temperature}:{prompt_hash}"
+
+    def _get_client(self):
+        if self._client is None:
+            import openai
+            self._client = openai.AsyncOpenAI(
+                base_url=self.endpoint,
+                api_key=self.api_key
+            )
+        return self._client
+
+    async def compress(self, content: str) -> str:
+        response = await self._get_client().chat.completions.create(
+            model=self.model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": content}
             ],
-            temperature=temperature,  # Adjusted based on model type
+            temperature=self.temperature,
         )
-        
-        # Log the temperature used
-        if progress and task_id:
-            progress.update(task_id, description=f"[cyan]Using temperature: {temperature} for model: {model}[/]")
-        else:
-            console.print(f"[cyan]Using temperature: {temperature} for model: {model}[/]")
-        
-        # Extract compressed content from response
         compressed_content = response.choices[0].message.content
-        
-        # Count tokens after compression
-        tokens_after = len(enc.encode(compressed_content))
-        
-        stats = {
-            'tokens_before': tokens_before,
-            'tokens_after': tokens_after,
-            'token_reduction': tokens_before - tokens_after,
-            'token_ratio': tokens_before / max(tokens_after, 1)
-        }
-        
-        if progress and task_id:
-            progress.update(task_id, description=f"[green]LLM compression complete[/]")
-        else:
-            console.print(f"[green]LLM compression:[/] {tokens_before} → {tokens_after} tokens ([bold cyan]{stats['token_ratio']:.2f}x[/])")
-        
-        return compressed_content, stats
-        
-    except Exception as e:
-        if progress and task_id:
-            progress.update(task_id, description=f"[red]LLM compression error: {e}[/]")
-        else:
-            console.print(f"[red]Error in LLM compression: {e}[/]")
-        # Count tokens in original content for consistent stats
-        enc = tiktoken.get_encoding("cl100k_base")
-        tokens = len(enc.encode(content))
-        stats = {
-            'tokens_before': tokens,
-            'tokens_after': tokens,
-            'token_reduction': 0,
-            'token_ratio': 1.0
-        }
-        return content, stats
-
-
-def compress_content(content: str, 
-                    use_llm: bool = False,
-                    llm_endpoint: str = "",
-                    llm_api_key: str = "",
-                    llm_model: str = "",
-                    progress=None,
-                    task_id=None) -> Tuple[str, Dict[str, Any]]:
+        if compressed_content is None:
+            raise ValueError("LLM returned an empty response")
+        return compressed_content
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class CacheBackend(CompressionBackend):
     """
-    Apply compression to content using external LLM compression (if enabled).
+    Memoize another backend by content hash.
     
-    Returns compressed content and statistics.
+    The most recent `maxsize` entries are kept in memory and, when `cache_dir`
+    is given, every entry is persisted as one file so repeated runs skip
+    unchanged documents. Concurrent requests for the same content share a
+    single backend call. Cache I/O is best-effort and never discards a
+    successful backend result.
     """
-    original_size = len(content)
-    current_content = content
-    stats = {}
-    
-    # External LLM compression (if enabled)
-    if use_llm:
+    name = "cache"
+
+    def __init__(self, backend: CompressionBackend,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 maxsize: int = 1024):
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self.backend = backend
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # entry_key -> [shared backend task, number of waiting callers]
+        self._in_flight: Dict[str, List[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache_key(self) -> str:
+        return self.backend.cache_key
+
+    @property
+    def reports_tokens(self) -> bool:
+        return self.backend.reports_tokens
+
+    def _entry_key(self, content: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.backend.cache_key.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _remember(self, entry_key: str, compressed: str) -> None:
+        if self.maxsize == 0:
+            return
+        self._memory[entry_key] = compressed
+        self._memory.move_to_end(entry_key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _read_entry(self, entry_key: str) -> Optional[str]:
+        path = self.cache_dir / entry_key
         try:
-            if progress and task_id:
-                progress.update(task_id, description="[cyan]Applying external LLM compression...[/]")
-            else:
-                console.print("[cyan]Applying external LLM compression...[/]")
-            
-            current_content, llm_stats = compress_with_llm(
-                current_content, llm_endpoint, llm_api_key, llm_model, progress, task_id
-            )
-            stats.update(llm_stats)
-        except Exception as e:
-            if progress and task_id:
-                progress.update(task_id, description=f"[red]Error in external LLM compression: {e}[/]")
-            else:
-                console.print(f"[red]Error in external LLM compression: {e}[/]")
-                console.print("[yellow]Falling back to original content[/]")
-    
-    final_compressed = current_content
-    final_size = len(final_compressed)
-    
-    # Calculate compression statistics
-    final_stats = {
-        'original_size': original_size,
-        'final_size': final_size,
-        'total_ratio': original_size / max(final_size, 1)
-    }
+            return path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+
+    def _write_entry(self, entry_key: str, compressed: str) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a uniquely named temporary file first so concurrent writers
+        # never collide and readers never see partial entries
+        f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir,
+                                        prefix=f"{entry_key}.", suffix='.tmp', delete=False)
+        tmp_path = f.name
+        try:
+            with f:
+                f.write(compressed)
+            os.replace(tmp_path, self.cache_dir / entry_key)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def _fill(self, entry_key: str, content: str) -> str:
+        if self.cache_dir is not None:
+            try:
+                cached = await asyncio.to_thread(self._read_entry, entry_key)
+            except Exception:
+                # Unreadable cache entry: treat as a miss
+                cached = None
+            if cached is not None:
+                self.hits += 1
+                self._remember(entry_key, cached)
+                return cached
+
+        self.misses += 1
+        compressed = await self.backend.compress(content)
+        self._remember(entry_key, compressed)
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_entry, entry_key, compressed)
+            except Exception:
+                # Persisting is best-effort; the compressed result is still valid
+                pass
+        return compressed
+
+    async def compress(self, content: str) -> str:
+        entry_key = self._entry_key(content)
+
+        cached = self._memory.get(entry_key)
+        if cached is not None:
+            self.hits += 1
+            self._memory.move_to_end(entry_key)
+            return cached
+
+        in_flight = self._in_flight.get(entry_key)
+        if in_flight is None:
+            in_flight = [asyncio.ensure_future(self._fill(entry_key, content)), 0]
+            self._in_flight[entry_key] = in_flight
+        else:
+            # Identical content is already being compressed; share its result
+            self.hits += 1
+
+        task = in_flight[0]
+        in_flight[1] += 1
+        try:
+            # Shield so one cancelled caller doesn't cancel the call for the others
+            return await asyncio.shield(task)
+        finally:
+            in_flight[1] -= 1
+            if in_flight[1] == 0:
+                self._in_flight.pop(entry_key, None)
+                # Nobody is waiting any more (e.g. the consumer stopped early)
+                if not task.done():
+                    task.cancel()
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+
+class Compressor:
+    """
+    Importable compression pipeline.
     
-    if use_llm:
-        final_stats['llm_size'] = len(current_content)
-        final_stats['llm_ratio'] = original_size / max(final_stats['llm_size'], 1)
-        
-        # Preserve token statistics from LLM compression
-        if 'tokens_before' in stats:
-            final_stats['tokens_before'] = stats['tokens_before']
-        if 'tokens_after' in stats:
-            final_stats['tokens_after'] = stats['tokens_after']
-        if 'token_ratio' in stats:
-            final_stats['token_ratio'] = stats['token_ratio']
-    
-    if progress and task_id:
-        progress.update(task_id, description="[green]Compression complete[/]")
-    
-    return final_compressed, final_stats
-
-def process_file(source_path: Path, target_path: Path, 
-                use_llm: bool = False,
-                llm_endpoint: str = "",
-                llm_api_key: str = "",
-                llm_model: str = "",
-                progress=None,
-                task_id=None,
-                source_dir_path: Path = None) -> Dict[str, Any]:
-    """Process a single file, compressing it and saving to target path."""
-    start_time = time.time()
+    Wraps a backend with size/token accounting and bounded concurrency. It
+    produces no console output; callers render `CompressionResult` objects
+    however they like. Keep one instance alive to reuse the backend client
+    and tokenizer across many documents.
     
-    try:
-        # Calculate relative path for display
-        rel_path = source_path.relative_to(source_dir_path) if source_dir_path else source_path
-        
-        # Read source content
-        with open(source_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if progress and task_id:
-            progress.update(task_id, description=f"[cyan]Compressing file[/] [blue]{rel_path}[/]")
-        
-        # Track time for compression
-        method_times = {
-            'llm': 0.0
-        }
-        
-        # Compress content
-        if use_llm:
-            llm_start = time.time()
+    Token counting defaults to the backend's `reports_tokens` and runs in a
+    worker thread so tokenizing large documents never blocks the event loop.
+    """
+
+    def __init__(self, backend: Optional[CompressionBackend] = None,
+                 max_concurrency: int = 8,
+                 count_tokens: Optional[bool] = None,
+                 encoding_name: str = "o200k_base"):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.backend = backend or LocalBackend()
+        self.max_concurrency = max_concurrency
+        self.count_tokens = self.backend.reports_tokens if count_tokens is None else count_tokens
+        self.encoding_name = encoding_name
+        self._encoding = None
+
+    async def __aenter__(self) -> "Compressor":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+    def _count_tokens(self, *texts: str) -> List[int]:
+        # Runs in a worker thread: loading the encoding may download the BPE file
+        if self._encoding is None:
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return [len(self._encoding.encode(text)) for text in texts]
+
+    async def compress(self, content: str, key: str = "") -> CompressionResult:
+        """
+        Compress a single document.
         
-        compressed_content, stats = compress_content(
-            content,
-            use_llm,
-            llm_endpoint,
-            llm_api_key,
-            llm_model,
-            progress,
-            task_id
+        Backend and tokenizer errors are captured in the result rather than
+        raised; on backend failure the original content is returned.
+        """
+        start_time = time.time()
+        error = None
+        try:
+            compressed = await self.backend.compress(content)
+        except Exception as e:
+            compressed = content
+            error = str(e) or type(e).__name__
+
+        tokens_before = tokens_after = None
+        if self.count_tokens:
+            try:
+                tokens_before, tokens_after = await asyncio.to_thread(self._count_tokens, content, compressed)
+            except Exception as e:
+                error = error or f"Token counting failed: {e}"
+
+        return CompressionResult(
+            key=key,
+            content=compressed,
+            original_size=len(content),
+            final_size=len(compressed),
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+            processing_time=time.time() - start_time,
+            backend=self.backend.name,
+            error=error
         )
+
+    async def compress_file(self, source_path: Union[str, Path], target_path: Union[str, Path]) -> CompressionResult:
+        """
+        Compress a single file and save it to target path.
         
-        # Create target directory if it doesn't exist
-        os.makedirs(target_path.parent, exist_ok=True)
-        
-        # Write compressed content to target file
-        with open(target_path, 'w', encoding='utf-8') as f:
-            f.write(compressed_content)
-        
-        # Calculate total processing time
-        processing_time = time.time() - start_time
-        
-        if progress and task_id:
-            ratio = stats['total_ratio']
-            ratio_color = "green" if ratio > 1.5 else "yellow" if ratio > 1.0 else "red"
-            time_str = format_time(processing_time)
-            rel_path = source_path.relative_to(source_dir_path) if source_dir_path else source_path
-            progress.update(task_id, description=f"[green]✓[/] [blue]{rel_path}[/] Saved ([{ratio_color}]{ratio:.2f}x[/]) in {time_str}")
-        
-        return {
-            'file': str(source_path),
-            'status': 'success',
-            'processing_time': processing_time,
-            **stats
-        }
-    except Exception as e:
-        if progress and task_id:
-            rel_path = source_path.relative_to(source_dir_path) if source_dir_path else source_path
-            progress.update(task_id, description=f"[red]✗ [blue]{rel_path}[/] Error: {e}[/]")
+        On backend failure the original content is still written to the target,
+        matching the historical fallback behaviour of the CLI.
+        """
+        source_path = Path(source_path)
+        target_path = Path(target_path)
+        start_time = time.time()
+
+        try:
+            content = await asyncio.to_thread(source_path.read_text, encoding='utf-8')
+        except Exception as e:
+            return CompressionResult(
+                key=str(source_path),
+                content=None,
+                processing_time=time.time() - start_time,
+                backend=self.backend.name,
+                error=str(e),
+                target=target_path
+            )
+
+        result = await self.compress(content, key=str(source_path))
+        result.target = target_path
+
+        try:
+            await asyncio.to_thread(_write_text, target_path, result.content)
+        except Exception as e:
+            result.error = str(e)
+
+        result.processing_time = time.time() - start_time
+        return result
+
+    async def compress_many(self, documents: Iterable[Tuple[str, str]]) -> AsyncIterator[CompressionResult]:
+        """
+        Compress `(key, content)` pairs, yielding results as they complete.
         
-        return {
-            'file': str(source_path),
-            'status': 'error',
-            'error': str(e)
-        }
+        At most `max_concurrency` documents are in flight at once and the input
+        iterable is consumed lazily, so arbitrarily long streams are fine.
+        """
+        stream = self._stream((key, self.compress(content, key=key)) for key, content in documents)
+        try:
+            async for result in stream:
+                yield result
+        finally:
+            # Close deterministically so pending work is cancelled as soon as the consumer stops
+            await stream.aclose()
+
+    async def compress_files(self, files: Iterable[Tuple[Union[str, Path], Union[str, Path]]]) -> AsyncIterator[CompressionResult]:
+        """Compress `(source_path, target_path)` pairs, yielding results as they complete."""
+        stream = self._stream((str(Path(source)), self.compress_file(source, target)) for source, target in files)
+        try:
+            async for result in stream:
+                yield result
+        finally:
+            await stream.aclose()
+
+    def _task_result(self, task: "asyncio.Future[CompressionResult]", key: str) -> CompressionResult:
+        # An unexpected error fails only its own document, never the whole stream
+        try:
+            return task.result()
+        except Exception as e:
+            return CompressionResult(
+                key=key,
+                content=None,
+                backend=self.backend.name,
+                error=str(e) or type(e).__name__
+            )
+
+    async def _stream(self, coroutines: Iterator[Tuple[str, Awaitable[CompressionResult]]]) -> AsyncIterator[CompressionResult]:
+        pending = set()
+        keys: Dict["asyncio.Future[CompressionResult]", str] = {}
+        try:
+            for key, coroutine in coroutines:
+                task = asyncio.ensure_future(coroutine)
+                keys[task] = key
+                pending.add(task)
+                if len(pending) >= self.max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield self._task_result(task, keys.pop(task))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield self._task_result(task, keys.pop(task))
+        finally:
+            # Consumer stopped early or was cancelled: don't leak in-flight work
+            for task in pending:
+                task.cancel()
+
+
+def _write_text(path: Path, content: str) -> None:
+    os.makedirs(path.parent, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
 
 def format_time(seconds: float) -> str:
     """Format time in seconds to a human-readable string"""
@@ -303,6 +522,30 @@ def get_ratio_color(ratio: float) -> str:
     else:
         return "red"
 
+async def run_with_progress(compressor: Compressor,
+                            files: List[Tuple[Path, Path]],
+                            rel_paths: Dict[str, Path],
+                            progress: Progress,
+                            overall_task) -> List[CompressionResult]:
+    """Drive the compressor over files, reporting each result on the progress display."""
+    results = []
+    try:
+        async for result in compressor.compress_files(files):
+            rel_path = rel_paths[result.key]
+            if result.ok:
+                ratio = result.total_ratio
+                ratio_color = "green" if ratio > 1.5 else "yellow" if ratio > 1.0 else "red"
+                time_str = format_time(result.processing_time)
+                description = f"[green]✓[/] [blue]{rel_path}[/] Saved ([{ratio_color}]{ratio:.2f}x[/]) in {time_str}"
+            else:
+                description = f"[red]✗ [blue]{rel_path}[/] Error: {result.error}[/]"
+            progress.add_task(description, total=1.0, completed=1.0)
+            progress.update(overall_task, advance=1)
+            results.append(result)
+    finally:
+        await compressor.aclose()
+    return results
+
 def print_fancy_header():
     """Print a fancy header for the script"""
     title = "Context Window Optimizer"
@@ -325,7 +568,9 @@ def main(
     exclude_patterns: List[str] = typer.Option(["rules-docs/examples/"], help="Patterns to exclude from processing"),
     use_llm: bool = typer.Option(False, help="Enable external LLM compression (disabled by default)"),
     llm_endpoint: str = typer.Option(None, help="OpenAI-compatible API endpoint"),
-    llm_model: str = typer.Option(None, help="Model to use for LLM compression")
+    llm_model: str = typer.Option(None, help="Model to use for LLM compression"),
+    concurrency: int = typer.Option(8, min=1, help="Maximum number of files compressed concurrently"),
+    cache_dir: Optional[str] = typer.Option(None, help="Directory for caching compressed output between runs")
 ):
     """
     Synchronize files from source directory to target directory,
@@ -387,6 +632,7 @@ def main(
             target_file = target_path / source_file.name
         
         source_files = [source_file]
+        jobs = [(source_file, target_file, target_file.relative_to(target_path))]
         console.print(f"Processing single file: [blue]{source_file}[/] → [green]{target_file}[/]")
     else:
         # Directory processing mode
@@ -407,6 +653,10 @@ def main(
             f for f in source_files 
             if f.is_file() and not any(exclude in str(f) for exclude in exclude_patterns)
         ]
+        jobs = [
+            (f, target_path / f.relative_to(source_path), f.relative_to(source_path))
+            for f in source_files
+        ]
     
     if not source_files:
         console.print(f"[yellow]No files found in {source_dir}[/]")
@@ -427,15 +677,24 @@ def main(
     config_table.add_row("External LLM", "✅ Enabled" if use_llm else "❌ Disabled")
     if use_llm:
         config_table.add_row("LLM Model", llm_model)
+    config_table.add_row("Concurrency", str(concurrency))
+    if cache_dir:
+        config_table.add_row("Cache Directory", cache_dir)
     
     console.print(Panel(config_table, title="[bold]Configuration[/]", border_style="blue"))
     console.print()
     
+    # Build the compression pipeline
+    backend = LLMBackend(llm_endpoint, llm_api_key, llm_model) if use_llm else LocalBackend()
+    if cache_dir:
+        backend = CacheBackend(backend, cache_dir)
+    compressor = Compressor(backend, max_concurrency=concurrency)
+    
     # Start timing the overall process
     overall_start_time = time.time()
     
-    # Process each file with fancy progress bar
-    results = []
+    # Process files concurrently with fancy progress bar
+    rel_paths = {str(source_file): rel_path for source_file, _, rel_path in jobs}
     
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -445,46 +704,18 @@ def main(
         TimeRemainingColumn(),
         console=console
     ) as progress:
-        overall_task = progress.add_task("[bold cyan]Processing files...", total=len(source_files))
-        
-        for source_file in source_files:
-            if file_path:
-                # We're in single file mode, target_file is already set
-                if source_file.is_relative_to(source_path):
-                    # File is within source directory, maintain directory structure
-                    rel_path = source_file.relative_to(source_path)
-                    target_file = target_path / rel_path
-                else:
-                    # File is outside source directory, just use the filename
-                    target_file = target_path / source_file.name
-                    rel_path = Path(source_file.name)  # For display purposes
-            else:
-                # Calculate the relative path (directory mode)
-                rel_path = source_file.relative_to(source_path)
-                target_file = target_path / rel_path
-            
-            # Display the relative path before starting compression
-            file_task = progress.add_task(f"[blue]{rel_path}[/]", total=1.0)
-            
-            # Process the file
-            result = process_file(
-                source_file, 
-                target_file,
-                use_llm,
-                llm_endpoint,
-                llm_api_key,
-                llm_model,
-                progress,
-                file_task,
-                source_path
-            )
-            results.append(result)
-            progress.update(file_task, completed=1.0)
-            progress.update(overall_task, advance=1)
+        overall_task = progress.add_task("[bold cyan]Processing files...", total=len(jobs))
+        results = asyncio.run(run_with_progress(
+            compressor,
+            [(source_file, target_file) for source_file, target_file, _ in jobs],
+            rel_paths,
+            progress,
+            overall_task
+        ))
     
     # Print summary
-    successful = [r for r in results if r['status'] == 'success']
-    failed = [r for r in results if r['status'] == 'error']
+    successful = [r for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
     
     console.print()
     summary_title = Text("Compression Summary", style="bold white on blue")
@@ -497,6 +728,8 @@ def main(
     methods_table.add_column("Status", style="yellow")
     
     methods_table.add_row("External LLM compression", "✅ Applied" if use_llm else "❌ Not used")
+    if isinstance(backend, CacheBackend):
+        methods_table.add_row("Cache", f"{backend.hits} hits, {backend.misses} misses")
     
     console.print(methods_table)
     console.print()
@@ -526,14 +759,11 @@ def main(
     total_final = 0
     
     for result in successful:
-        # Get relative path from source_dir
-        file_path = Path(result['file'])
-        rel_path = file_path.relative_to(source_path)
+        rel_path = rel_paths[result.key]
         
-        original = result['original_size']
-        llm = result['llm_size']
-        final = result['final_size']
-        ratio = result['total_ratio']
+        original = result.original_size
+        final = result.final_size
+        ratio = result.total_ratio
         
         total_original += original
         total_final += final
@@ -542,7 +772,7 @@ def main(
         ratio_style = get_ratio_color(ratio)
         
         # Get timing information
-        processing_time = result.get('processing_time', 0)
+        processing_time = result.processing_time
         time_str = format_time(processing_time)
         time_style = get_time_color(processing_time)
         
@@ -556,10 +786,10 @@ def main(
         ]
         
         # Add token info if available from LLM compression
-        if use_llm and 'tokens_before' in result and 'tokens_after' in result:
-            tokens_before = result.get('tokens_before', 0)
-            tokens_after = result.get('tokens_after', 0)
-            token_ratio = tokens_before / max(tokens_after, 1)
+        if use_llm and result.token_ratio is not None:
+            tokens_before = result.tokens_before
+            tokens_after = result.tokens_after
+            token_ratio = result.token_ratio
             token_ratio_style = get_ratio_color(token_ratio)
             
             row.extend([
@@ -575,7 +805,7 @@ def main(
         ratio_style = get_ratio_color(overall_ratio)
         
         # Calculate total processing time
-        total_processing_time = sum([r.get('processing_time', 0) for r in successful])
+        total_processing_time = sum([r.processing_time for r in successful])
         avg_processing_time = total_processing_time / max(len(successful), 1)
         
         # Format timing information
@@ -593,8 +823,8 @@ def main(
         
         # Add token info totals if LLM compression was used
         if use_llm:
-            total_tokens_before = sum([r.get('tokens_before', 0) for r in successful if 'tokens_before' in r])
-            total_tokens_after = sum([r.get('tokens_after', 0) for r in successful if 'tokens_after' in r])
+            total_tokens_before = sum([r.tokens_before for r in successful if r.tokens_before is not None])
+            total_tokens_after = sum([r.tokens_after for r in successful if r.tokens_after is not None])
             token_ratio = total_tokens_before / max(total_tokens_after, 1)
             token_ratio_style = get_ratio_color(token_ratio)
             
@@ -618,9 +848,7 @@ def main(
         error_table.add_column("Error", style="red")
         
         for result in failed:
-            file_path = Path(result['file'])
-            rel_path = file_path.relative_to(source_path)
-            error_table.add_row(str(rel_path), result['error'])
+            error_table.add_row(str(rel_paths[result.key]), result.error)
         
         console.print(Panel(error_table, title="[bold]Failed Files[/]", border_style="red"))
     
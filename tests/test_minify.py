@@ -0,0 +1,269 @@
+"""Tests for the importable Compressor API in minify.py (no network)."""
+
+import asyncio
+
+import pytest
+
+from minify import CacheBackend, CompressionBackend, Compressor, LLMBackend, LocalBackend
+
+
+class StubBackend(CompressionBackend):
+    """Upper-cases content, optionally waiting on a per-document gate event."""
+    name = "stub"
+
+    def __init__(self, gates=None, fail_on=None, result=None):
+        self.gates = gates or {}
+        self.fail_on = fail_on
+        self.result = result
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def compress(self, content):
+        self.calls.append(content)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if content in self.gates:
+                await self.gates[content].wait()
+            else:
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if self.fail_on is not None and self.fail_on in content:
+            raise RuntimeError("backend exploded")
+        return self.result if self.result is not None else content.upper()
+
+
+async def collect(compressor, documents):
+    return [result async for result in compressor.compress_many(documents)]
+
+
+def test_compress_many_bounds_concurrency():
+    backend = StubBackend()
+    compressor = Compressor(backend, max_concurrency=3)
+
+    results = asyncio.run(collect(compressor, ((str(i), f"doc {i}") for i in range(20))))
+
+    assert len(results) == 20
+    assert backend.max_in_flight == 3
+    assert sorted(r.key for r in results) == sorted(str(i) for i in range(20))
+
+
+def test_compress_many_yields_in_completion_order():
+    async def run():
+        gates = {content: asyncio.Event() for content in ("first", "second", "third")}
+        compressor = Compressor(StubBackend(gates=gates), max_concurrency=3)
+        stream = compressor.compress_many([("a", "third"), ("b", "second"), ("c", "first")])
+        results = []
+        try:
+            for content in ("first", "second", "third"):
+                gates[content].set()
+                results.append(await stream.__anext__())
+        finally:
+            await stream.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert [r.key for r in results] == ["c", "b", "a"]
+    assert [r.content for r in results] == ["FIRST", "SECOND", "THIRD"]
+
+
+def test_compress_many_cancels_in_flight_work_on_early_exit():
+    never = asyncio.Event()
+    backend = StubBackend(gates={"slow 1": never, "slow 2": never, "slow 3": never})
+    compressor = Compressor(backend, max_concurrency=4)
+
+    async def first_only():
+        stream = compressor.compress_many([("fast", "fast"), ("s1", "slow 1"), ("s2", "slow 2"), ("s3", "slow 3")])
+        async for result in stream:
+            break
+        await stream.aclose()
+        # Let the cancellations propagate into the backend
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(first_only())
+
+    assert result.key == "fast"
+    assert backend.cancelled == 3
+    assert backend.in_flight == 0
+
+
+def test_tokenizer_failure_fails_only_that_document():
+    compressor = Compressor(StubBackend(), count_tokens=True, encoding_name="no-such-encoding")
+
+    results = asyncio.run(collect(compressor, [("1", "a"), ("2", "b"), ("3", "c")]))
+
+    assert sorted(r.key for r in results) == ["1", "2", "3"]
+    assert all(not r.ok and r.error.startswith("Token counting failed") for r in results)
+    assert sorted(r.content for r in results) == ["A", "B", "C"]
+    assert all(r.tokens_before is None for r in results)
+
+
+def test_unexpected_error_does_not_abort_stream():
+    class Flaky(Compressor):
+        async def compress(self, content, key=""):
+            if key == "boom":
+                raise RuntimeError("unexpected")
+            return await super().compress(content, key=key)
+
+    results = asyncio.run(collect(Flaky(StubBackend()), [("1", "a"), ("boom", "b"), ("3", "c")]))
+    by_key = {r.key: r for r in results}
+
+    assert set(by_key) == {"1", "boom", "3"}
+    assert by_key["1"].ok and by_key["3"].ok
+    assert not by_key["boom"].ok
+    assert by_key["boom"].error == "unexpected"
+    assert by_key["boom"].content is None
+
+
+def test_backend_failure_falls_back_to_original_content():
+    compressor = Compressor(StubBackend(fail_on="bad"))
+
+    results = asyncio.run(collect(compressor, [("ok", "fine"), ("ko", "bad input")]))
+    by_key = {r.key: r for r in results}
+
+    assert by_key["ok"].ok and by_key["ok"].content == "FINE"
+    assert not by_key["ko"].ok
+    assert by_key["ko"].error == "backend exploded"
+    assert by_key["ko"].content == "bad input"
+    assert by_key["ko"].total_ratio == 1.0
+
+
+def test_compress_file_writes_target(tmp_path):
+    source = tmp_path / "src" / "rules.md"
+    source.parent.mkdir()
+    source.write_text("rules", encoding="utf-8")
+    target = tmp_path / "out" / "nested" / "rules.md"
+
+    result = asyncio.run(Compressor(StubBackend()).compress_file(source, target))
+
+    assert result.ok
+    assert result.target == target
+    assert target.read_text(encoding="utf-8") == "RULES"
+
+
+def test_compress_file_reports_missing_source(tmp_path):
+    result = asyncio.run(Compressor(StubBackend()).compress_file(tmp_path / "missing.md", tmp_path / "out.md"))
+
+    assert not result.ok
+    assert result.content is None
+    assert not (tmp_path / "out.md").exists()
+
+
+def test_token_counting_follows_backend():
+    assert Compressor(LocalBackend()).count_tokens is False
+    assert Compressor(CacheBackend(LocalBackend())).count_tokens is False
+    assert Compressor(LLMBackend("http://localhost", "key", "gpt-4o")).count_tokens is True
+    assert Compressor(LocalBackend(), count_tokens=True).count_tokens is True
+
+
+def test_llm_cache_key_includes_endpoint():
+    local = LLMBackend("http://localhost:8000/v1", "key", "gpt-4o")
+    remote = LLMBackend("https://api.openai.com/v1", "key", "gpt-4o")
+
+    assert local.cache_key != remote.cache_key
+
+
+def test_cache_hits_and_misses_in_memory():
+    backend = StubBackend()
+    cache = CacheBackend(backend)
+    compressor = Compressor(cache, max_concurrency=1)
+
+    results = asyncio.run(collect(compressor, [("1", "a"), ("2", "b"), ("3", "a")]))
+
+    assert [r.content for r in results] == ["A", "B", "A"]
+    assert backend.calls == ["a", "b"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_memory_is_bounded():
+    backend = StubBackend()
+    cache = CacheBackend(backend, maxsize=2)
+    compressor = Compressor(cache, max_concurrency=1)
+
+    asyncio.run(collect(compressor, [("1", "a"), ("2", "b"), ("3", "b"), ("4", "c"), ("5", "a")]))
+
+    # "a" was evicted by "c"; "b" was still cached when requested again
+    assert backend.calls == ["a", "b", "c", "a"]
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_cache_persists_across_instances(tmp_path):
+    first = StubBackend()
+    asyncio.run(collect(Compressor(CacheBackend(first, tmp_path)), [("1", "a"), ("2", "b")]))
+
+    second = StubBackend()
+    cache = CacheBackend(second, tmp_path)
+    results = asyncio.run(collect(Compressor(cache), [("1", "a"), ("2", "b")]))
+
+    assert sorted(r.content for r in results) == ["A", "B"]
+    assert second.calls == []
+    assert cache.hits == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_cache_coalesces_concurrent_duplicates(tmp_path):
+    backend = StubBackend()
+    cache = CacheBackend(backend, tmp_path)
+    compressor = Compressor(cache, max_concurrency=8)
+
+    async def batches():
+        results = []
+        for batch in range(20):
+            results += await collect(compressor, [(f"{batch}-{i}", f"same {batch}") for i in range(8)])
+        return results
+
+    results = asyncio.run(batches())
+
+    assert all(r.ok for r in results)
+    assert all(r.content.startswith("SAME") for r in results)
+    assert len(backend.calls) == 20
+    assert (cache.hits, cache.misses) == (140, 20)
+    assert not list(tmp_path.glob("*.tmp"))
+    assert len(list(tmp_path.iterdir())) == 20
+
+
+def test_cache_write_failure_keeps_backend_result(tmp_path):
+    # A regular file where the cache directory should be makes every write fail
+    blocked = tmp_path / "cache"
+    blocked.write_text("not a directory", encoding="utf-8")
+    compressor = Compressor(CacheBackend(StubBackend(), blocked))
+
+    results = asyncio.run(collect(compressor, [("1", "a"), ("2", "b")]))
+
+    assert all(r.ok for r in results)
+    assert sorted(r.content for r in results) == ["A", "B"]
+
+
+def test_cache_does_not_store_failures():
+    backend = StubBackend(fail_on="bad")
+    cache = CacheBackend(backend)
+
+    async def twice():
+        with pytest.raises(RuntimeError):
+            await cache.compress("bad")
+        with pytest.raises(RuntimeError):
+            await cache.compress("bad")
+
+    asyncio.run(twice())
+
+    assert backend.calls == ["bad", "bad"]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_cache_write_failure_leaves_no_temp_files(tmp_path):
+    # A lone surrogate cannot be encoded as UTF-8, so writing the entry fails
+    compressor = Compressor(CacheBackend(StubBackend(result="bad \ud800"), tmp_path))
+
+    results = asyncio.run(collect(compressor, [("1", "a")]))
+
+    assert results[0].ok
+    assert results[0].content == "bad \ud800"
+    assert list(tmp_path.iterdir()) == []